@@ -1,13 +1,24 @@
-from fastapi import FastAPI, APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from cachetools import TTLCache
 from dotenv import load_dotenv
 import os
+import re
+import random
+import string
+import asyncio
 import logging
+import orjson
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from typing import List, Optional, Dict, Any
+from collections import Counter
 import uuid
+from contextlib import suppress
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -17,6 +28,11 @@ load_dotenv(ROOT_DIR / ".env")
 
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "tictactoe")
+CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", "10000"))
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CURSOR_BATCH_SIZE = 100
+MAX_LIST_LIMIT = 100
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "2"))
 
 # ================== LOGGING ==================
 logging.basicConfig(
@@ -26,7 +42,7 @@ logging.basicConfig(
 logger = logging.getLogger("server")
 
 # ================== APP ==================
-app = FastAPI(title="Tic-Tac-Toe API", version="1.0.0")
+app = FastAPI(title="Tic-Tac-Toe API", version="1.0.0", default_response_class=ORJSONResponse)
 api_router = APIRouter()  # IMPORTANT: no prefix here
 
 # ================== DB ==================
@@ -35,13 +51,35 @@ db = None
 USE_MEMORY_DB = False
 memory_players: Dict[str, Dict[str, Any]] = {}
 memory_games: Dict[str, Dict[str, Any]] = {}
+# Secondary indexes over the memory store, mirroring the MongoDB indexes.
+memory_players_by_username: Dict[str, Dict[str, Any]] = {}
+memory_games_by_code: Dict[str, Dict[str, Any]] = {}
+memory_games_by_player: Dict[str, set[str]] = {}
+
+# Write-through read caches in front of MongoDB. Every write goes through this
+# process, so entries are refreshed on write; the TTL bounds staleness if the
+# app is ever run with several workers.
+player_cache: TTLCache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS)
+game_cache: TTLCache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS)
+game_code_cache: TTLCache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS)
 
 async def create_indexes():
     await db.players.create_index("username", unique=True)
+    # Lower-cased copy of the username so case-insensitive prefix searches
+    # can use a B-tree index; backfill players created before it existed.
+    await db.players.update_many(
+        {"username_lower": {"$exists": False}},
+        [{"$set": {"username_lower": {"$toLower": "$username"}}}],
+    )
+    await db.players.create_index("username_lower")
     await db.games.create_index("code", unique=True)
-    await db.games.create_index("status")
-    await db.games.create_index("player_x_id")
-    await db.games.create_index("player_o_id")
+    # Shaped after the queries: each player branch of the completed-games
+    # $or can be filtered and sorted by completed_at from one index, and the
+    # lobby filters on status and mode, newest first. Their prefixes also
+    # serve lookups by status or player id alone.
+    await db.games.create_index([("status", 1), ("mode", 1), ("created_at", -1)])
+    await db.games.create_index([("player_x_id", 1), ("status", 1), ("completed_at", -1)])
+    await db.games.create_index([("player_o_id", 1), ("status", 1), ("completed_at", -1)])
 
 @app.on_event("startup")
 async def startup():
@@ -77,32 +115,58 @@ class PlayerSymbol(str, Enum):
     X = "X"
     O = "O"
 
+# ================== CLOCK ==================
+UTC = timezone.utc
+
+def now_iso() -> str:
+    return datetime.now(UTC).isoformat()
+
+# ================== IDS ==================
+def new_id() -> str:
+    # Unhyphenated hex keeps ids at 32 characters and skips the formatting.
+    return uuid.uuid4().hex
+
 # ================== MODELS ==================
 class Player(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     username: str
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = Field(default_factory=now_iso)
 
 class CreatePlayerRequest(BaseModel):
     username: str
 
 class GameState(BaseModel):
     board: List[Optional[str]] = Field(default_factory=lambda: [None] * 9)
+    x_mask: int = 0
+    o_mask: int = 0
     current_turn: PlayerSymbol = PlayerSymbol.X
     winner: Optional[str] = None
     winning_line: Optional[List[int]] = None
     is_draw: bool = False
 
+    @model_validator(mode="before")
+    @classmethod
+    def sync_board_and_masks(cls, data: Any) -> Any:
+        # The masks are authoritative; older documents only carry the board.
+        if not isinstance(data, dict):
+            return data
+        if "x_mask" in data:
+            data = {**data, "board": masks_to_board(data["x_mask"], data.get("o_mask", 0))}
+        elif "board" in data:
+            x_mask, o_mask = board_to_masks(data["board"])
+            data = {**data, "x_mask": x_mask, "o_mask": o_mask}
+        return data
+
 class GameMove(BaseModel):
     player_id: str
     symbol: PlayerSymbol
     position: int
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timestamp: str = Field(default_factory=now_iso)
 
 class Game(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     code: str
     mode: GameMode
     status: GameStatus
@@ -112,7 +176,7 @@ class Game(BaseModel):
     player_o_username: Optional[str] = None
     state: GameState = Field(default_factory=GameState)
     moves: List[GameMove] = Field(default_factory=list)
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = Field(default_factory=now_iso)
     completed_at: Optional[str] = None
 
 class UpdateUsernameRequest(BaseModel):
@@ -122,6 +186,15 @@ class CreateGameRequest(BaseModel):
     mode: GameMode
     player_id: str
 
+class BootstrapRequest(BaseModel):
+    username: str
+    mode: GameMode = GameMode.LOCAL
+
+class BootstrapResponse(BaseModel):
+    player: Player
+    game: Game
+    code: str
+
 class JoinGameRequest(BaseModel):
     player_id: str
 
@@ -138,12 +211,11 @@ class RematchRequest(BaseModel):
     player_id: str
 
 # ================== HELPERS ==================
+# Look-alike characters are left out so codes are easy to read aloud.
+GAME_CODE_CHARS = "".join(c for c in string.ascii_uppercase + string.digits if c not in "O0I1L")
+
 def generate_game_code():
-    import random, string
-    chars = string.ascii_uppercase + string.digits
-    for c in ["O", "0", "I", "1", "L"]:
-        chars = chars.replace(c, "")
-    return "".join(random.choices(chars, k=6))
+    return "".join(random.choices(GAME_CODE_CHARS, k=6))
 
 WINNING_LINES = [
     [0, 1, 2],
@@ -156,82 +228,248 @@ WINNING_LINES = [
     [2, 4, 6],
 ]
 
-def now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-def evaluate_board(board: List[Optional[str]]) -> tuple[Optional[str], Optional[List[int]], bool]:
-    for line in WINNING_LINES:
-        a, b, c = line
-        if board[a] and board[a] == board[b] == board[c]:
-            return board[a], line, False
-    if all(cell is not None for cell in board):
+WIN_MASKS = tuple(1 << a | 1 << b | 1 << c for a, b, c in WINNING_LINES)
+FULL_BOARD_MASK = 0x1FF
+
+def board_to_masks(board: List[Optional[str]]) -> tuple[int, int]:
+    x_mask = 0
+    o_mask = 0
+    for i, cell in enumerate(board):
+        if cell == PlayerSymbol.X.value:
+            x_mask |= 1 << i
+        elif cell == PlayerSymbol.O.value:
+            o_mask |= 1 << i
+    return x_mask, o_mask
+
+def masks_to_board(x_mask: int, o_mask: int) -> List[Optional[str]]:
+    return [
+        PlayerSymbol.X.value if x_mask >> i & 1 else PlayerSymbol.O.value if o_mask >> i & 1 else None
+        for i in range(9)
+    ]
+
+def state_masks(state: Dict[str, Any]) -> tuple[int, int]:
+    if "x_mask" in state:
+        return state["x_mask"], state["o_mask"]
+    return board_to_masks(state["board"])
+
+def storage_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    # The board is rebuilt from the masks on read, so it is never persisted.
+    return {k: v for k, v in state.items() if k != "board"}
+
+def evaluate_board(x_mask: int, o_mask: int) -> tuple[Optional[str], Optional[List[int]], bool]:
+    for mask, line in zip(WIN_MASKS, WINNING_LINES):
+        if x_mask & mask == mask:
+            return PlayerSymbol.X.value, line, False
+        if o_mask & mask == mask:
+            return PlayerSymbol.O.value, line, False
+    if x_mask | o_mask == FULL_BOARD_MASK:
         return None, None, True
     return None, None, False
 
+def player_outcome(game: Dict[str, Any], player_id: str) -> str:
+    state = game["state"]
+    if state.get("is_draw"):
+        return "draw"
+    is_player_x = game["player_x_id"] == player_id
+    winner = state.get("winner")
+    if (winner == PlayerSymbol.X.value and is_player_x) or (winner == PlayerSymbol.O.value and not is_player_x):
+        return "win"
+    return "loss"
+
 def normalize_game(game_doc: Dict[str, Any]) -> Dict[str, Any]:
+    # Stored documents already follow the Game schema, so skip a full
+    # Pydantic validation pass and only rebuild the board from the masks.
     if not game_doc:
         return {}
-    return Game(**game_doc).model_dump()
+    game = {key: value for key, value in game_doc.items() if key != "_id"}
+    state = game["state"]
+    x_mask, o_mask = state_masks(state)
+    game["state"] = {**state, "x_mask": x_mask, "o_mask": o_mask, "board": masks_to_board(x_mask, o_mask)}
+    return game
+
+def index_memory_game(game: Dict[str, Any]) -> None:
+    for player_id in (game["player_x_id"], game.get("player_o_id")):
+        if player_id:
+            memory_games_by_player.setdefault(player_id, set()).add(game["id"])
+
+def memory_games_for_player(player_id: str) -> List[Dict[str, Any]]:
+    return [memory_games[game_id] for game_id in memory_games_by_player.get(player_id, ())]
+
+def cache_game(game: Dict[str, Any]) -> None:
+    game_cache[game["id"]] = game
+    game_code_cache[game["code"]] = game["id"]
 
 async def get_player_by_id(player_id: str) -> Optional[Dict[str, Any]]:
     if USE_MEMORY_DB:
         return memory_players.get(player_id)
-    return await db.players.find_one({"id": player_id}, {"_id": 0})
+    player = player_cache.get(player_id)
+    if player is None:
+        player = await db.players.find_one({"id": player_id}, {"_id": 0})
+        if player is None:
+            return None
+        player_cache[player_id] = player
+    return dict(player)
 
 async def get_player_by_username(username: str) -> Optional[Dict[str, Any]]:
     if USE_MEMORY_DB:
-        return next((p for p in memory_players.values() if p["username"] == username), None)
+        return memory_players_by_username.get(username)
     return await db.players.find_one({"username": username}, {"_id": 0})
 
 async def save_player(player: Dict[str, Any]) -> None:
     if USE_MEMORY_DB:
         memory_players[player["id"]] = player
+        memory_players_by_username[player["username"]] = player
     else:
-        await db.players.insert_one(player)
+        await db.players.insert_one({**player, "username_lower": player["username"].lower()})
+        player_cache[player["id"]] = player
 
 async def update_player_username(player_id: str, username: str) -> None:
     if USE_MEMORY_DB:
-        if player_id in memory_players:
-            memory_players[player_id]["username"] = username
-        for game in memory_games.values():
+        player = memory_players.get(player_id)
+        if player:
+            memory_players_by_username.pop(player["username"], None)
+            player["username"] = username
+            memory_players_by_username[username] = player
+        for game in memory_games_for_player(player_id):
             if game["player_x_id"] == player_id:
                 game["player_x_username"] = username
             if game.get("player_o_id") == player_id:
                 game["player_o_username"] = username
     else:
-        await db.players.update_one({"id": player_id}, {"$set": {"username": username}})
+        await db.players.update_one(
+            {"id": player_id},
+            {"$set": {"username": username, "username_lower": username.lower()}},
+        )
         await db.games.update_many({"player_x_id": player_id}, {"$set": {"player_x_username": username}})
         await db.games.update_many({"player_o_id": player_id}, {"$set": {"player_o_username": username}})
+        if player_id in player_cache:
+            player_cache[player_id] = {**player_cache[player_id], "username": username}
+        for game_id, game in list(game_cache.items()):
+            if game["player_x_id"] == player_id:
+                game_cache[game_id] = game = {**game, "player_x_username": username}
+            if game.get("player_o_id") == player_id:
+                game_cache[game_id] = {**game, "player_o_username": username}
 
 async def get_game_by_id(game_id: str) -> Optional[Dict[str, Any]]:
     if USE_MEMORY_DB:
         return memory_games.get(game_id)
-    return await db.games.find_one({"id": game_id}, {"_id": 0})
+    game = game_cache.get(game_id)
+    if game is None:
+        game = await db.games.find_one({"id": game_id}, {"_id": 0})
+        if game is None:
+            return None
+        cache_game(game)
+    return dict(game)
+
+async def get_game_state_only(game_id: str) -> Optional[Dict[str, Any]]:
+    # For validating writes: the moves history is not needed, so a cache miss
+    # reads the document without it. The memory store returns the full game.
+    if USE_MEMORY_DB:
+        return memory_games.get(game_id)
+    game = game_cache.get(game_id)
+    if game is not None:
+        return dict(game)
+    return await db.games.find_one({"id": game_id}, {"_id": 0, "moves": 0})
 
 async def get_game_by_code(code: str) -> Optional[Dict[str, Any]]:
     if USE_MEMORY_DB:
-        return next((g for g in memory_games.values() if g["code"] == code), None)
-    return await db.games.find_one({"code": code}, {"_id": 0})
+        return memory_games_by_code.get(code)
+    game_id = game_code_cache.get(code)
+    if game_id is not None:
+        game = await get_game_by_id(game_id)
+        if game is not None:
+            return game
+    game = await db.games.find_one({"code": code}, {"_id": 0})
+    if game is None:
+        return None
+    cache_game(game)
+    return dict(game)
 
 async def save_game(game: Dict[str, Any]) -> None:
+    game = {**game, "state": storage_state(game["state"])}
     if USE_MEMORY_DB:
+        # Mirror the unique index on "code" that MongoDB enforces.
+        if game["code"] in memory_games_by_code:
+            raise DuplicateKeyError(f"duplicate game code {game['code']}")
         memory_games[game["id"]] = game
+        memory_games_by_code[game["code"]] = game
+        index_memory_game(game)
     else:
-        await db.games.insert_one(game)
+        await db.games.insert_one(dict(game))
+        cache_game(game)
 
-async def update_game(game_id: str, update_fields: Dict[str, Any]) -> None:
+async def update_game(game_id: str, update_fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if USE_MEMORY_DB:
-        if game_id in memory_games:
-            memory_games[game_id].update(update_fields)
-    else:
-        await db.games.update_one({"id": game_id}, {"$set": update_fields})
-
-async def generate_unique_code() -> str:
+        game = memory_games.get(game_id)
+        if game:
+            game.update(update_fields)
+            index_memory_game(game)
+        return game
+    game = await db.games.find_one_and_update(
+        {"id": game_id},
+        {"$set": update_fields},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    if game is None:
+        return None
+    cache_game(game)
+    return dict(game)
+
+def state_filter(state: Dict[str, Any]) -> Dict[str, Any]:
+    # Matches a stored game only while its board is still the given one.
+    if "x_mask" in state:
+        return {"state.x_mask": state["x_mask"], "state.o_mask": state["o_mask"]}
+    return {"state.x_mask": {"$exists": False}, "state.board": state["board"]}
+
+async def append_move(
+    game_id: str,
+    expected_state: Dict[str, Any],
+    move_doc: Dict[str, Any],
+    state_patch: Dict[str, Any],
+    status: str,
+    completed_at: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    # The move was validated against expected_state; if another move has
+    # landed since, nothing is written and None is returned.
+    if USE_MEMORY_DB:
+        game = memory_games.get(game_id)
+        if not game or state_masks(game["state"]) != state_masks(expected_state):
+            return None
+        game.setdefault("moves", []).append(move_doc)
+        game["state"].update(state_patch)
+        game["status"] = status
+        game["completed_at"] = completed_at
+        return game
+    game = await db.games.find_one_and_update(
+        {"id": game_id, **state_filter(expected_state)},
+        {
+            "$push": {"moves": move_doc},
+            "$set": {
+                **{f"state.{key}": value for key, value in state_patch.items()},
+                "status": status,
+                "completed_at": completed_at,
+            },
+        },
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    if game is None:
+        # The cached copy may be what the stale validation read from.
+        game_cache.pop(game_id, None)
+        return None
+    cache_game(game)
+    return dict(game)
+
+async def save_game_with_unique_code(game: Game) -> None:
+    # Collisions are rare, so insert optimistically and let the unique index
+    # on "code" reject duplicates instead of looking the code up first.
     while True:
-        code = generate_game_code()
-        existing = await get_game_by_code(code)
-        if not existing:
-            return code
+        try:
+            await save_game(game.model_dump())
+            return
+        except DuplicateKeyError:
+            game.code = generate_game_code()
 
 # ================== PLAYER ROUTES ==================
 @api_router.post("/players", response_model=Player, status_code=200)
@@ -243,7 +481,9 @@ async def create_or_get_player(req: CreatePlayerRequest):
     if existing:
         return Player(**existing)
 
-    player = Player(username=username)
+    # The request is already validated, so assemble the new document
+    # without a second validation pass.
+    player = Player.model_construct(username=username)
     await save_player(player.model_dump())
     return player
 
@@ -273,16 +513,17 @@ async def update_player(player_id: str, req: UpdateUsernameRequest):
 async def search_players(query: str):
     if len(query) < 2:
         return []
+    prefix = query.lower()
     if USE_MEMORY_DB:
         results = [
             p for p in memory_players.values()
-            if query.lower() in p["username"].lower()
+            if p["username"].lower().startswith(prefix)
         ][:20]
         return [Player(**p) for p in results]
     cursor = db.players.find(
-        {"username": {"$regex": query, "$options": "i"}},
+        {"username_lower": {"$regex": f"^{re.escape(prefix)}"}},
         {"_id": 0},
-    ).limit(20)
+    ).limit(20).batch_size(20)
     return [Player(**doc) async for doc in cursor]
 
 @api_router.get("/players/{player_id}/stats")
@@ -292,32 +533,56 @@ async def get_player_stats(player_id: str):
         raise HTTPException(status_code=404, detail="Player not found")
 
     if USE_MEMORY_DB:
-        games = [
-            g for g in memory_games.values()
-            if g["status"] == GameStatus.COMPLETED.value
-            and (g["player_x_id"] == player_id or g.get("player_o_id") == player_id)
-        ]
+        outcomes: Counter = Counter()
+        for g in memory_games_for_player(player_id):
+            if g["status"] == GameStatus.COMPLETED.value:
+                outcomes[player_outcome(g, player_id)] += 1
+        wins = outcomes["win"]
+        draws = outcomes["draw"]
+        total_games = sum(outcomes.values())
     else:
-        cursor = db.games.find(
+        # Tally in MongoDB so only the counters come back over the wire.
+        pipeline = [
             {
-                "status": GameStatus.COMPLETED.value,
-                "$or": [{"player_x_id": player_id}, {"player_o_id": player_id}],
+                "$match": {
+                    "status": GameStatus.COMPLETED.value,
+                    "$or": [{"player_x_id": player_id}, {"player_o_id": player_id}],
+                }
             },
-            {"_id": 0},
-        )
-        games = [doc async for doc in cursor]
-
-    total_games = len(games)
-    wins = 0
-    draws = 0
-    for game in games:
-        if game["state"].get("is_draw"):
-            draws += 1
-            continue
-        is_player_x = game["player_x_id"] == player_id
-        winner = game["state"].get("winner")
-        if (winner == PlayerSymbol.X.value and is_player_x) or (winner == PlayerSymbol.O.value and not is_player_x):
-            wins += 1
+            {
+                "$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "draws": {"$sum": {"$cond": ["$state.is_draw", 1, 0]}},
+                    "wins": {
+                        "$sum": {
+                            "$cond": [
+                                {
+                                    "$or": [
+                                        {"$and": [
+                                            {"$eq": ["$state.winner", PlayerSymbol.X.value]},
+                                            {"$eq": ["$player_x_id", player_id]},
+                                        ]},
+                                        {"$and": [
+                                            {"$eq": ["$state.winner", PlayerSymbol.O.value]},
+                                            {"$ne": ["$player_x_id", player_id]},
+                                        ]},
+                                    ]
+                                },
+                                1,
+                                0,
+                            ]
+                        }
+                    },
+                }
+            },
+        ]
+        totals = await db.games.aggregate(pipeline).to_list(length=1)
+        totals = totals[0] if totals else {}
+        wins = totals.get("wins", 0)
+        draws = totals.get("draws", 0)
+        total_games = totals.get("total", 0)
+
     losses = total_games - wins - draws
     win_rate = round((wins / total_games) * 100) if total_games else 0
 
@@ -330,46 +595,46 @@ async def get_player_stats(player_id: str):
         "win_rate": win_rate,
     }
 
-@api_router.get("/players/{player_id}/history", response_model=List[Game])
-async def get_player_history(player_id: str, limit: int = 20):
+@api_router.get("/players/{player_id}/history", response_model=None, responses={200: {"model": List[Game]}})
+async def get_player_history(player_id: str, limit: int = Query(20, ge=1, le=MAX_LIST_LIMIT)):
     player = await get_player_by_id(player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     if USE_MEMORY_DB:
         games = [
-            g for g in memory_games.values()
+            g for g in memory_games_for_player(player_id)
             if g["status"] == GameStatus.COMPLETED.value
-            and (g["player_x_id"] == player_id or g.get("player_o_id") == player_id)
         ]
         games.sort(key=lambda g: g.get("completed_at") or g["created_at"], reverse=True)
-        return [Game(**g) for g in games[:limit]]
+        return [normalize_game(g) for g in games[:limit]]
     cursor = db.games.find(
         {
             "status": GameStatus.COMPLETED.value,
             "$or": [{"player_x_id": player_id}, {"player_o_id": player_id}],
         },
         {"_id": 0},
-    ).sort("completed_at", -1).limit(limit)
-    return [Game(**doc) async for doc in cursor]
+    ).sort("completed_at", -1).limit(limit).batch_size(min(limit, CURSOR_BATCH_SIZE))
+    return [normalize_game(doc) async for doc in cursor]
 
-@api_router.get("/players/{username}/games", response_model=List[Game])
-async def get_player_games_by_username(username: str, limit: int = 20):
+@api_router.get("/players/{username}/games", response_model=None, responses={200: {"model": List[Game]}})
+async def get_player_games_by_username(username: str, limit: int = Query(20, ge=1, le=MAX_LIST_LIMIT)):
     if USE_MEMORY_DB:
+        player = memory_players_by_username.get(username)
         games = [
-            g for g in memory_games.values()
+            g for g in (memory_games_for_player(player["id"]) if player else [])
             if g["status"] == GameStatus.COMPLETED.value
             and (g["player_x_username"] == username or g.get("player_o_username") == username)
         ]
         games.sort(key=lambda g: g.get("completed_at") or g["created_at"], reverse=True)
-        return [Game(**g) for g in games[:limit]]
+        return [normalize_game(g) for g in games[:limit]]
     cursor = db.games.find(
         {
             "status": GameStatus.COMPLETED.value,
             "$or": [{"player_x_username": username}, {"player_o_username": username}],
         },
         {"_id": 0},
-    ).sort("completed_at", -1).limit(limit)
-    return [Game(**doc) async for doc in cursor]
+    ).sort("completed_at", -1).limit(limit).batch_size(min(limit, CURSOR_BATCH_SIZE))
+    return [normalize_game(doc) async for doc in cursor]
 
 # ================== ROOT ==================
 @api_router.get("/")
@@ -385,17 +650,46 @@ class ConnectionManager:
         await websocket.accept()
         self.connections.setdefault(game_id, {})[player_id] = websocket
 
-    def disconnect(self, game_id: str, player_id: str):
-        self.connections.get(game_id, {}).pop(player_id, None)
+    def disconnect(self, game_id: str, player_id: str, websocket: Optional[WebSocket] = None) -> bool:
+        # When a socket is given, only drop it if the player has not since
+        # reconnected on a new one. Empty games are removed so the map does
+        # not grow with every game ever played. Returns whether it dropped one.
+        sockets = self.connections.get(game_id)
+        if sockets is None:
+            return False
+        removed = False
+        if websocket is None or sockets.get(player_id) is websocket:
+            removed = sockets.pop(player_id, None) is not None
+        if not sockets:
+            del self.connections[game_id]
+        return removed
 
     async def send_to_game(self, game_id: str, message: Dict[str, Any]):
-        for websocket in list(self.connections.get(game_id, {}).values()):
-            try:
-                await websocket.send_json(message)
-            except Exception:
-                continue
+        # Encode once and send the same bytes as a binary frame to every
+        # socket in the game, so no socket re-encodes the payload.
+        payload = orjson.dumps(message)
+        sockets = list(self.connections.get(game_id, {}).items())
+        # Send to every socket at once so one slow client cannot hold up the
+        # rest; sockets that fail or time out are dropped from the game.
+        results = await asyncio.gather(
+            *(asyncio.wait_for(websocket.send_bytes(payload), WS_SEND_TIMEOUT_SECONDS) for _, websocket in sockets),
+            return_exceptions=True,
+        )
+        dropped = []
+        for (player_id, websocket), result in zip(sockets, results):
+            # Skip players that reconnected on a new socket in the meantime.
+            if isinstance(result, Exception) and self.disconnect(game_id, player_id, websocket):
+                dropped.append(player_id)
+                # A timed-out send may have left a partial frame, so close the
+                # socket; the client's reconnect then gets a fresh snapshot.
+                with suppress(Exception):
+                    await asyncio.wait_for(websocket.close(code=1011), WS_SEND_TIMEOUT_SECONDS)
+        # Tell the remaining players, as a clean disconnect would.
+        for player_id in dropped:
+            await self.send_to_game(game_id, {"type": "player_disconnected", "player_id": player_id})
 
 manager = ConnectionManager()
+PONG_FRAME = orjson.dumps({"type": "pong"}).decode()
 
 @api_router.websocket("/ws/{game_id}/{player_id}")
 async def websocket_endpoint(websocket: WebSocket, game_id: str, player_id: str):
@@ -403,14 +697,19 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str, player_id: str)
     try:
         game = await get_game_by_id(game_id)
         if game:
-            await websocket.send_json({"type": "connected", "game": normalize_game(game)})
+            await websocket.send_text(orjson.dumps({"type": "connected", "game": normalize_game(game)}).decode())
         while True:
-            data = await websocket.receive_json()
+            data = orjson.loads(await websocket.receive_text())
             if data.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
+                await websocket.send_text(PONG_FRAME)
+            elif data.get("type") == "resync":
+                game = await get_game_by_id(game_id)
+                if game:
+                    await websocket.send_text(orjson.dumps({"type": "resync", "game": normalize_game(game)}).decode())
     except WebSocketDisconnect:
-        manager.disconnect(game_id, player_id)
-        await manager.send_to_game(game_id, {"type": "player_disconnected", "player_id": player_id})
+        # A socket dropped by send_to_game has already been announced.
+        if manager.disconnect(game_id, player_id, websocket):
+            await manager.send_to_game(game_id, {"type": "player_disconnected", "player_id": player_id})
 
 # ================== CORS ==================
 app.add_middleware(
@@ -433,9 +732,10 @@ async def create_game(req: CreateGameRequest):
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
 
-    code = await generate_unique_code()
+    code = generate_game_code()
     if req.mode == GameMode.LOCAL:
-        game = Game(
+        game = Game.model_construct(
+            state=GameState.model_construct(),
             code=code,
             mode=req.mode,
             status=GameStatus.IN_PROGRESS,
@@ -445,7 +745,8 @@ async def create_game(req: CreateGameRequest):
             player_o_username="Player O",
         )
     else:
-        game = Game(
+        game = Game.model_construct(
+            state=GameState.model_construct(),
             code=code,
             mode=req.mode,
             status=GameStatus.WAITING,
@@ -453,40 +754,49 @@ async def create_game(req: CreateGameRequest):
             player_x_username=player["username"],
         )
 
-    await save_game(game.model_dump())
+    await save_game_with_unique_code(game)
     return game
 
-@api_router.get("/games/waiting", response_model=List[Game])
-async def get_waiting_games():
+@api_router.post("/session/bootstrap", response_model=BootstrapResponse)
+async def bootstrap_session(req: BootstrapRequest):
+    # Get-or-create the player and open a game in one round trip.
+    player = await create_or_get_player(CreatePlayerRequest(username=req.username))
+    game = await create_game(CreateGameRequest(mode=req.mode, player_id=player.id))
+    return {"player": player, "game": game, "code": game.code}
+
+@api_router.get("/games/waiting", response_model=None, responses={200: {"model": List[Game]}})
+async def get_waiting_games(limit: int = Query(50, ge=1, le=MAX_LIST_LIMIT)):
     if USE_MEMORY_DB:
         games = [
             g for g in memory_games.values()
             if g["status"] == GameStatus.WAITING.value and g["mode"] == GameMode.ONLINE.value
         ]
-        return [Game(**g) for g in games]
+        # Newest first, so abandoned games cannot crowd new ones out of the lobby.
+        games.sort(key=lambda g: g["created_at"], reverse=True)
+        return [normalize_game(g) for g in games[:limit]]
     cursor = db.games.find(
         {"status": GameStatus.WAITING.value, "mode": GameMode.ONLINE.value},
         {"_id": 0},
-    )
-    return [Game(**doc) async for doc in cursor]
+    ).sort("created_at", -1).limit(limit).batch_size(min(limit, CURSOR_BATCH_SIZE))
+    return [normalize_game(doc) async for doc in cursor]
 
-@api_router.get("/games/{game_id}", response_model=Game)
+@api_router.get("/games/{game_id}", response_model=None, responses={200: {"model": Game}})
 async def get_game(game_id: str):
     game = await get_game_by_id(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
-    return Game(**game)
+    return normalize_game(game)
 
-@api_router.get("/games/by-code/{code}", response_model=Game)
+@api_router.get("/games/by-code/{code}", response_model=None, responses={200: {"model": Game}})
 async def get_game_by_code_endpoint(code: str):
     game = await get_game_by_code(code.upper())
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
-    return Game(**game)
+    return normalize_game(game)
 
-@api_router.post("/games/{game_id}/join", response_model=Game)
+@api_router.post("/games/{game_id}/join", response_model=None, responses={200: {"model": Game}})
 async def join_game(game_id: str, req: JoinGameRequest):
-    game = await get_game_by_id(game_id)
+    game = await get_game_state_only(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     if game["mode"] != GameMode.ONLINE.value:
@@ -505,22 +815,24 @@ async def join_game(game_id: str, req: JoinGameRequest):
         "player_o_username": player["username"],
         "status": GameStatus.IN_PROGRESS.value,
     }
-    await update_game(game_id, update_fields)
-    game.update(update_fields)
+    game = await update_game(game_id, update_fields)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
 
-    await manager.send_to_game(game_id, {"type": "player_joined", "game": normalize_game(game)})
-    return Game(**game)
+    game_data = normalize_game(game)
+    await manager.send_to_game(game_id, {"type": "player_joined", "game": game_data})
+    return game_data
 
-@api_router.post("/games/join-by-code", response_model=Game)
+@api_router.post("/games/join-by-code", response_model=None, responses={200: {"model": Game}})
 async def join_game_by_code(req: JoinByCodeRequest):
     game = await get_game_by_code(req.code.upper())
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     return await join_game(game["id"], JoinGameRequest(player_id=req.player_id))
 
-@api_router.post("/games/{game_id}/move", response_model=Game)
+@api_router.post("/games/{game_id}/move", response_model=None, responses={200: {"model": Game}})
 async def make_move(game_id: str, req: MoveRequest):
-    game = await get_game_by_id(game_id)
+    game = await get_game_state_only(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     if game["status"] == GameStatus.COMPLETED.value:
@@ -532,8 +844,9 @@ async def make_move(game_id: str, req: MoveRequest):
         raise HTTPException(status_code=400, detail="Invalid position")
     if req.player_id not in {game["player_x_id"], game.get("player_o_id")}:
         raise HTTPException(status_code=400, detail="Player not in this game")
-    board = list(game["state"]["board"])
-    if board[req.position] is not None:
+    x_mask, o_mask = state_masks(game["state"])
+    cell = 1 << req.position
+    if (x_mask | o_mask) & cell:
         raise HTTPException(status_code=400, detail="Cell already occupied")
 
     current_turn = PlayerSymbol(game["state"]["current_turn"])
@@ -544,40 +857,53 @@ async def make_move(game_id: str, req: MoveRequest):
         if current_turn == PlayerSymbol.O and req.player_id != game.get("player_o_id"):
             raise HTTPException(status_code=400, detail="Not your turn")
 
-    board[req.position] = current_turn.value
-    move = GameMove(player_id=req.player_id, symbol=current_turn, position=req.position)
-    moves = list(game.get("moves", []))
-    moves.append(move.model_dump())
+    if current_turn == PlayerSymbol.X:
+        x_mask |= cell
+    else:
+        o_mask |= cell
+    # One timestamp per request, shared by the move and completed_at.
+    timestamp = now_iso()
+    move = GameMove(player_id=req.player_id, symbol=current_turn, position=req.position, timestamp=timestamp)
+    move_doc = move.model_dump()
 
-    winner, winning_line, is_draw = evaluate_board(board)
+    winner, winning_line, is_draw = evaluate_board(x_mask, o_mask)
     new_status = game["status"]
     completed_at = game.get("completed_at")
     next_turn = PlayerSymbol.O if current_turn == PlayerSymbol.X else PlayerSymbol.X
+    state_patch = {
+        "x_mask": x_mask,
+        "o_mask": o_mask,
+        "winner": winner,
+        "winning_line": winning_line,
+        "is_draw": is_draw,
+    }
     if winner or is_draw:
         new_status = GameStatus.COMPLETED.value
-        completed_at = now_iso()
+        completed_at = timestamp
     else:
-        game["state"]["current_turn"] = next_turn.value
-
-    game["state"]["board"] = board
-    game["state"]["winner"] = winner
-    game["state"]["winning_line"] = winning_line
-    game["state"]["is_draw"] = is_draw
-    game["status"] = new_status
-    game["moves"] = moves
-    game["completed_at"] = completed_at
+        state_patch["current_turn"] = next_turn.value
 
-    await update_game(game_id, {
-        "state": game["state"],
-        "status": new_status,
-        "moves": moves,
-        "completed_at": completed_at,
-    })
+    is_online = game["mode"] == GameMode.ONLINE.value
+    game = await append_move(game_id, dict(game["state"]), move_doc, state_patch, new_status, completed_at)
+    if not game:
+        raise HTTPException(status_code=409, detail="Game changed, please retry")
 
-    if game["mode"] == GameMode.ONLINE.value:
-        await manager.send_to_game(game_id, {"type": "game_update", "game": normalize_game(game)})
+    if is_online:
+        # Peers already hold the game, so only the change is broadcast.
+        # move_number lets a client spot a missed move and ask to resync.
+        await manager.send_to_game(
+            game_id,
+            {
+                "type": "move",
+                "move_number": (x_mask | o_mask).bit_count(),
+                "move": move_doc,
+                "state": state_patch,
+                "status": new_status,
+                "completed_at": completed_at,
+            },
+        )
 
-    return Game(**game)
+    return normalize_game(game)
 
 @api_router.post("/games/{game_id}/rematch", response_model=Game)
 async def request_rematch(game_id: str, req: RematchRequest):
@@ -588,7 +914,7 @@ async def request_rematch(game_id: str, req: RematchRequest):
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
 
-    code = await generate_unique_code()
+    code = generate_game_code()
     player_o_id = game.get("player_o_id")
     player_o_username = game.get("player_o_username")
     if req.mode == GameMode.ONLINE and not player_o_id:
@@ -599,7 +925,8 @@ async def request_rematch(game_id: str, req: RematchRequest):
     else:
         status = GameStatus.IN_PROGRESS
 
-    new_game = Game(
+    new_game = Game.model_construct(
+        state=GameState.model_construct(),
         code=code,
         mode=req.mode,
         status=status,
@@ -608,7 +935,7 @@ async def request_rematch(game_id: str, req: RematchRequest):
         player_o_id=player_o_id if req.mode == GameMode.LOCAL or player_o_id else None,
         player_o_username=player_o_username if req.mode == GameMode.LOCAL or player_o_username else None,
     )
-    await save_game(new_game.model_dump())
+    await save_game_with_unique_code(new_game)
 
     if req.mode == GameMode.ONLINE:
         await manager.send_to_game(
@@ -625,16 +952,12 @@ async def get_game_replay(game_id: str):
         raise HTTPException(status_code=404, detail="Game not found")
     game_data = normalize_game(game)
     moves = game_data.get("moves", [])
-    snapshots = []
-    board = [None] * 9
-    snapshots.append({"board": list(board), "move": None})
-    for move in moves:
-        board[move["position"]] = move["symbol"]
-        snapshots.append({"board": list(board), "move": move})
-
+    # Send one delta per move instead of a full board per step; the client
+    # replays them onto the initial board to rebuild each frame.
     return {
         "game": game_data,
-        "snapshots": snapshots,
+        "initial_board": [None] * 9,
+        "deltas": [{"position": move["position"], "symbol": move["symbol"]} for move in moves],
         "total_moves": len(moves),
     }
 
@@ -4,275 +4,408 @@ Comprehensive backend API testing for Tic-Tac-Toe application
 Tests all endpoints: players, games, moves, stats, history, replay, WebSocket
 """
 
-import requests
+import aiohttp
+import argparse
+import asyncio
+import fnmatch
 import sys
-import json
+import time
+import orjson
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+try:
+    import uvloop
+except ImportError:  # optional; not available on Windows
+    uvloop = None
+
+# Request paths are relative to the session's base_url.
+API_PREFIX = "/api/"
+# Winning moves for X: positions 0, 1, 2 (top row); X wins on move 5.
+WINNING_MOVES: tuple[int, ...] = (0, 3, 1, 4, 2)
+STATS_KEYS: frozenset[str] = frozenset({'total_games', 'wins', 'losses', 'draws', 'win_rate'})
+REPLAY_KEYS: frozenset[str] = frozenset({'game', 'initial_board', 'deltas', 'total_moves'})
+
+@dataclass(slots=True)
+class TestResult:
+    """Outcome of one API call: whether the status matched, and the parsed body"""
+    __test__ = False  # not a pytest test class
+    ok: bool
+    status: int
+    body: Any = None
+
 class TicTacToeAPITester:
-    def __init__(self, base_url="http://localhost:8080"):
+    # Setup: each step builds on the state left by the previous one.
+    SETUP_TESTS: tuple[str, ...] = (
+        'test_root_endpoint',
+        'test_create_player',
+        'test_get_player',
+        'test_player_stats_empty',
+        'test_create_local_game',
+        'test_game_code_generation',
+        'test_make_moves_complete_game',
+    )
+    # Reads with no ordering between them once the game is completed.
+    READ_ONLY_TESTS: tuple[str, ...] = (
+        'test_get_game',
+        'test_get_game_by_code',
+        'test_game_replay',
+        'test_get_waiting_games',
+        'test_search_players',
+        'test_player_history',
+        'test_player_stats_after_game',
+        'test_get_player_games_by_username',
+    )
+    # Writes run last so they cannot change what the reads observe.
+    WRITE_TESTS: tuple[str, ...] = (
+        'test_invalid_move',
+        'test_join_game_by_code',
+        'test_create_online_game',
+        'test_moves_via_ws',
+        'test_rematch_request',
+    )
+
+    # Setup tests that test_bootstrap replaces when running fused.
+    FUSED_TESTS: tuple[str, ...] = (
+        'test_create_player',
+        'test_create_local_game',
+        'test_game_code_generation',
+    )
+
+    def __init__(self, base_url="http://localhost:8080", stream_logs: bool = False, test_filter: str = "*",
+                 fused: bool = False):
         self.base_url = base_url
+        self.fused = fused
+        # fnmatch pattern applied to test names; tests outside it are skipped.
+        self.test_filter = test_filter
+        # Log lines are buffered and written once per phase unless streaming.
+        self.stream_logs = stream_logs
+        self._log_buf: list[str] = []
         self.tests_run = 0
         self.tests_passed = 0
         self.player_data = None
         self.game_data = None
         self.completed_game_id = None
+        # Tests that returned False, raised, or bailed out in a guard.
+        self.failed_tests: list[str] = []
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Log timestamp, reformatted only when the wall-clock second changes.
+        self._log_second = -1
+        self._log_stamp = ""
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive HTTP session, created on first use inside the event loop"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                base_url=self.base_url,
+                # Resolve the host once and keep idle connections for the
+                # whole run rather than per request.
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    limit_per_host=32,
+                    use_dns_cache=True,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                ),
+                headers={'Content-Type': 'application/json'},
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
+        return self._session
 
     def log(self, message: str, level: str = "INFO"):
         """Log test messages with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] {level}: {message}")
+        second = int(time.time())
+        if second != self._log_second:
+            self._log_second = second
+            self._log_stamp = time.strftime("%H:%M:%S", time.localtime(second))
+        line = f"[{self._log_stamp}] {level}: {message}\n"
+        if self.stream_logs:
+            sys.stdout.write(line)
+        else:
+            self._log_buf.append(line)
 
-    def run_test(self, name: str, method: str, endpoint: str, expected_status: int, 
-                 data: Optional[Dict] = None, headers: Optional[Dict] = None) -> tuple[bool, Dict]:
-        """Run a single API test"""
-        url = f"{self.base_url}/api/{endpoint}"
-        if headers is None:
-            headers = {'Content-Type': 'application/json'}
+    def _flush_logs(self):
+        """Write buffered log lines in one call"""
+        if self._log_buf:
+            sys.stdout.write("".join(self._log_buf))
+            self._log_buf.clear()
+        sys.stdout.flush()
 
+    async def run_test(self, name: str, method: str, endpoint: str, expected_status: int,
+                       data: Optional[Dict | bytes] = None, headers: Optional[Dict] = None) -> TestResult:
+        """Run a single API test; data may be a dict or an already encoded JSON body"""
         self.tests_run += 1
         self.log(f"Testing {name}...")
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=10)
-
-            success = response.status_code == expected_status
-            if success:
+            if isinstance(data, dict):
+                data = orjson.dumps(data)
+            async with self.session.request(method, API_PREFIX + endpoint, data=data, headers=headers) as response:
+                status = response.status
+                raw = await response.read()
+
+            # Parse the body once; None marks a body that is not JSON.
+            try:
+                body = orjson.loads(raw) if raw else {}
+            except orjson.JSONDecodeError:
+                body = None
+
+            if status == expected_status:
                 self.tests_passed += 1
-                self.log(f"✅ {name} - Status: {response.status_code}")
-                try:
-                    return True, response.json()
-                except:
-                    return True, {}
+                self.log(f"✅ {name} - Status: {status}")
+                return TestResult(True, status, {} if body is None else body)
+            self.log(f"❌ {name} - Expected {expected_status}, got {status}", "ERROR")
+            if body is not None:
+                self.log(f"   Error details: {body}", "ERROR")
             else:
-                self.log(f"❌ {name} - Expected {expected_status}, got {response.status_code}", "ERROR")
-                try:
-                    error_detail = response.json()
-                    self.log(f"   Error details: {error_detail}", "ERROR")
-                except:
-                    self.log(f"   Response text: {response.text[:200]}", "ERROR")
-                return False, {}
-
-        except requests.exceptions.RequestException as e:
+                self.log(f"   Response text: {raw[:200].decode(errors='replace')}", "ERROR")
+            return TestResult(False, status, body)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             self.log(f"❌ {name} - Network Error: {str(e)}", "ERROR")
-            return False, {}
+            return TestResult(False, 0)
         except Exception as e:
             self.log(f"❌ {name} - Unexpected Error: {str(e)}", "ERROR")
-            return False, {}
+            return TestResult(False, 0)
 
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self):
         """Test the root API endpoint"""
-        success, response = self.run_test(
+        result = await self.run_test(
             "Root API Endpoint",
             "GET", 
             "",
             200
         )
-        return success
+        return result.ok
 
-    def test_create_player(self):
+    async def test_create_player(self):
         """Test player creation"""
         test_username = f"test_player_{datetime.now().strftime('%H%M%S')}"
-        success, response = self.run_test(
+        result = await self.run_test(
             "Create Player",
             "POST",
             "players",
             200,
             data={"username": test_username}
         )
-        if success and 'id' in response:
-            self.player_data = response
-            self.log(f"   Created player: {response['username']} (ID: {response['id'][:8]}...)")
+        if result.ok and 'id' in result.body:
+            self.player_data = result.body
+            self.log(f"   Created player: {result.body['username']} (ID: {result.body['id'][:8]}...)")
             return True
         return False
 
-    def test_get_player(self):
+    async def test_bootstrap(self):
+        """Test creating the player and local game in one call, falling back if unsupported"""
+        # Probe without side effects: a GET on the POST-only route answers
+        # 405 when the endpoint exists and 404 on servers that predate it.
+        try:
+            async with self.session.get(API_PREFIX + "session/bootstrap") as probe:
+                supported = probe.status != 404
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            supported = True  # let run_test report the network error
+        if not supported:
+            self.log("   Server does not support /session/bootstrap, using separate calls")
+            for name in self.FUSED_TESTS:
+                await self._run_guarded(getattr(self, name))
+            return bool(self.player_data and self.game_data)
+
+        test_username = f"test_player_{datetime.now().strftime('%H%M%S')}"
+        result = await self.run_test(
+            "Bootstrap Session",
+            "POST",
+            "session/bootstrap",
+            200,
+            data={"username": test_username}
+        )
+        if not result.ok:
+            return False
+        self.player_data = result.body['player']
+        self.game_data = result.body['game']
+        self.log(f"   Bootstrapped player {self.player_data['username']} with game {self.game_data['code']}")
+        return len(result.body['code']) == 6 and result.body['code'] == self.game_data['code']
+
+    async def test_get_player(self):
         """Test getting player by ID"""
         if not self.player_data:
             self.log("❌ No player data available for get test", "ERROR")
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Player by ID",
             "GET",
             f"players/{self.player_data['id']}",
             200
         )
-        return success and response.get('username') == self.player_data['username']
+        return result.ok and result.body.get('username') == self.player_data['username']
 
-    def test_player_stats_empty(self):
+    async def test_player_stats_empty(self):
         """Test getting player stats (should be empty initially)"""
         if not self.player_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Player Stats (Empty)",
             "GET",
             f"players/{self.player_data['id']}/stats",
             200
         )
-        if success:
-            expected_stats = ['total_games', 'wins', 'losses', 'draws', 'win_rate']
-            has_all_stats = all(key in response for key in expected_stats)
-            if has_all_stats and response['total_games'] == 0:
-                self.log(f"   Stats correct: {response}")
+        if result.ok:
+            has_all_stats = STATS_KEYS <= result.body.keys()
+            if has_all_stats and result.body['total_games'] == 0:
+                self.log(f"   Stats correct: {result.body}")
                 return True
             else:
-                self.log(f"   Stats incomplete or incorrect: {response}", "ERROR")
+                self.log(f"   Stats incomplete or incorrect: {result.body}", "ERROR")
         return False
 
-    def test_create_local_game(self):
+    async def test_create_local_game(self):
         """Test creating a local game"""
         if not self.player_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Create Local Game",
             "POST",
             "games",
             200,
             data={"mode": "local", "player_id": self.player_data['id']}
         )
-        if success and 'id' in response:
-            self.game_data = response
-            self.log(f"   Created game: {response['id'][:8]}... (Mode: {response['mode']})")
+        if result.ok and 'id' in result.body:
+            self.game_data = result.body
+            self.log(f"   Created game: {result.body['id'][:8]}... (Mode: {result.body['mode']})")
             return True
         return False
 
-    def test_get_game(self):
+    async def test_get_game(self):
         """Test getting game by ID"""
         if not self.game_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Game by ID",
             "GET",
             f"games/{self.game_data['id']}",
             200
         )
-        return success and response.get('id') == self.game_data['id']
+        return result.ok and result.body.get('id') == self.game_data['id']
 
-    def test_make_moves_complete_game(self):
+    async def test_make_moves_complete_game(self):
         """Test making moves to complete a game (X wins)"""
         if not self.game_data or not self.player_data:
             return False
 
-        # Winning moves for X: positions 0, 1, 2 (top row)
-        moves = [0, 3, 1, 4, 2]  # X wins on move 5
+        bodies = [orjson.dumps({"player_id": self.player_data['id'], "position": position}) for position in WINNING_MOVES]
         
-        for i, position in enumerate(moves):
+        for i, (position, body) in enumerate(zip(WINNING_MOVES, bodies)):
             move_name = f"Make Move {i+1} (Position {position})"
-            success, response = self.run_test(
+            result = await self.run_test(
                 move_name,
                 "POST",
                 f"games/{self.game_data['id']}/move",
                 200,
-                data={"player_id": self.player_data['id'], "position": position}
+                data=body
             )
             
-            if not success:
+            if not result.ok:
                 return False
                 
             # Update game data
-            self.game_data = response
+            self.game_data = result.body
             
             # Check if game is completed
-            if response['status'] == 'completed':
-                self.completed_game_id = response['id']
-                if response['state']['winner']:
-                    self.log(f"   Game completed! Winner: {response['state']['winner']}")
-                elif response['state']['is_draw']:
+            if result.body['status'] == 'completed':
+                self.completed_game_id = result.body['id']
+                if result.body['state']['winner']:
+                    self.log(f"   Game completed! Winner: {result.body['state']['winner']}")
+                elif result.body['state']['is_draw']:
                     self.log(f"   Game completed! Result: Draw")
                 break
         
         return True
 
-    def test_invalid_move(self):
+    async def test_invalid_move(self):
         """Test making an invalid move (occupied cell)"""
         if not self.game_data or not self.player_data:
             return False
             
         # Try to move to position 0 which should already be occupied
-        success, response = self.run_test(
+        result = await self.run_test(
             "Invalid Move (Occupied Cell)",
             "POST",
             f"games/{self.game_data['id']}/move",
             400,  # Should return 400 for invalid move
             data={"player_id": self.player_data['id'], "position": 0}
         )
-        return success  # Success means we got the expected 400 error
+        return result.ok  # Success means we got the expected 400 error
 
-    def test_game_replay(self):
+    async def test_game_replay(self):
         """Test getting game replay data"""
         if not self.completed_game_id:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Game Replay",
             "GET",
             f"games/{self.completed_game_id}/replay",
             200
         )
         
-        if success:
-            required_keys = ['game', 'snapshots', 'total_moves']
-            has_all_keys = all(key in response for key in required_keys)
-            if has_all_keys and len(response['snapshots']) > 0:
-                self.log(f"   Replay data: {response['total_moves']} moves, {len(response['snapshots'])} snapshots")
+        if result.ok:
+            has_all_keys = REPLAY_KEYS <= result.body.keys()
+            if has_all_keys and len(result.body['deltas']) == result.body['total_moves']:
+                self.log(f"   Replay data: {result.body['total_moves']} moves, {len(result.body['deltas'])} deltas")
                 return True
             else:
-                self.log(f"   Replay data incomplete: {list(response.keys())}", "ERROR")
+                self.log(f"   Replay data incomplete: {list(result.body.keys())}", "ERROR")
         return False
 
-    def test_player_stats_after_game(self):
+    async def test_player_stats_after_game(self):
         """Test getting player stats after completing a game"""
         if not self.player_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Player Stats (After Game)",
             "GET",
             f"players/{self.player_data['id']}/stats",
             200
         )
         
-        if success and response['total_games'] > 0:
-            self.log(f"   Updated stats: {response}")
+        if result.ok and result.body['total_games'] > 0:
+            self.log(f"   Updated stats: {result.body}")
             return True
         return False
 
-    def test_player_history(self):
+    async def test_player_history(self):
         """Test getting player match history"""
         if not self.player_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Player History",
             "GET",
             f"players/{self.player_data['id']}/history",
             200
         )
         
-        if success and isinstance(response, list) and len(response) > 0:
-            self.log(f"   History: {len(response)} games")
+        if result.ok and isinstance(result.body, list) and len(result.body) > 0:
+            self.log(f"   History: {len(result.body)} games")
             return True
-        elif success and len(response) == 0:
+        elif result.ok and len(result.body) == 0:
             self.log("   History: No completed games yet")
             return True
         return False
 
-    def test_create_online_game(self):
+    async def test_create_online_game(self):
         """Test creating an online game"""
         if not self.player_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Create Online Game",
             "POST",
             "games",
@@ -280,31 +413,124 @@ class TicTacToeAPITester:
             data={"mode": "online", "player_id": self.player_data['id']}
         )
         
-        if success and response.get('mode') == 'online' and response.get('status') == 'waiting':
-            self.log(f"   Online game created: {response['id'][:8]}... (Status: {response['status']})")
+        if result.ok and result.body.get('mode') == 'online' and result.body.get('status') == 'waiting':
+            self.log(f"   Online game created: {result.body['id'][:8]}... (Status: {result.body['status']})")
             return True
         return False
 
-    def test_get_waiting_games(self):
+    async def test_get_waiting_games(self):
         """Test getting list of waiting games"""
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Waiting Games",
             "GET",
             "games/waiting",
             200
         )
         
-        if success and isinstance(response, list):
-            self.log(f"   Found {len(response)} waiting games")
+        if result.ok and isinstance(result.body, list):
+            self.log(f"   Found {len(result.body)} waiting games")
             return True
         return False
 
-    def test_rematch_request(self):
+    async def test_moves_via_ws(self):
+        """Test an online game end to end, reading state from the WebSocket"""
+        if not self.player_data:
+            return False
+
+        result = await self.run_test(
+            "Create Opponent Player",
+            "POST",
+            "players",
+            200,
+            data={"username": f"test_opponent_{datetime.now().strftime('%H%M%S')}"}
+        )
+        if not result.ok:
+            return False
+        opponent = result.body
+        result = await self.run_test(
+            "Create Online Game (WebSocket)",
+            "POST",
+            "games",
+            200,
+            data={"mode": "online", "player_id": self.player_data['id']}
+        )
+        if not result.ok:
+            return False
+        game = result.body
+        result = await self.run_test(
+            "Join Online Game (WebSocket)",
+            "POST",
+            f"games/{game['id']}/join",
+            200,
+            data={"player_id": opponent['id']}
+        )
+        if not result.ok:
+            return False
+
+        frames = deque()
+        completed = asyncio.Event()
+
+        async def receive(ws):
+            async for msg in ws:
+                if msg.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    break
+                frame = orjson.loads(msg.data)
+                frames.append(frame)
+                if frame.get("status") == "completed":
+                    completed.set()
+
+        # X plays the top row; turns alternate, so moves are sent back to back.
+        moves = [(self.player_data['id'], 0), (opponent['id'], 3), (self.player_data['id'], 1),
+                 (opponent['id'], 4), (self.player_data['id'], 2)]
+        async with self.session.ws_connect(f"/api/ws/{game['id']}/{self.player_data['id']}") as ws:
+            receiver = asyncio.create_task(receive(ws))
+            completed_waiter = None
+            try:
+                for i, (player_id, position) in enumerate(moves):
+                    result = await self.run_test(
+                        f"Online Move {i+1} (Position {position})",
+                        "POST",
+                        f"games/{game['id']}/move",
+                        200,
+                        data=orjson.dumps({"player_id": player_id, "position": position})
+                    )
+                    if not result.ok:
+                        return False
+
+                self.tests_run += 1
+                self.log("Testing Game Completion via WebSocket...")
+                # Wait for the completed frame, but stop early if the receiver
+                # dies so its error is reported rather than a bare timeout.
+                completed_waiter = asyncio.create_task(completed.wait())
+                await asyncio.wait({receiver, completed_waiter}, timeout=5, return_when=asyncio.FIRST_COMPLETED)
+                if not completed.is_set():
+                    if receiver.done() and receiver.exception() is not None:
+                        reason = f"receiver failed: {receiver.exception()!r}"
+                    elif receiver.done():
+                        reason = "WebSocket closed"
+                    else:
+                        reason = "timed out"
+                    self.log(f"❌ No completed frame after {len(frames)} WebSocket frames ({reason})", "ERROR")
+                    return False
+                self.tests_passed += 1
+                self.log(f"✅ Game Completion via WebSocket - {len(frames)} frames, winner {frames[-1]['state']['winner']}")
+                return True
+            finally:
+                for task in (receiver, completed_waiter):
+                    if task is None:
+                        continue
+                    if task.cancel():
+                        with suppress(asyncio.CancelledError):
+                            await task
+                    elif not task.cancelled():
+                        task.exception()  # mark a crash as retrieved
+
+    async def test_rematch_request(self):
         """Test requesting a rematch"""
         if not self.completed_game_id or not self.player_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Request Rematch",
             "POST",
             f"games/{self.completed_game_id}/rematch",
@@ -312,12 +538,12 @@ class TicTacToeAPITester:
             data={"mode": "local", "player_id": self.player_data['id']}
         )
         
-        if success and 'id' in response:
-            self.log(f"   Rematch created: {response['id'][:8]}...")
+        if result.ok and 'id' in result.body:
+            self.log(f"   Rematch created: {result.body['id'][:8]}...")
             return True
         return False
 
-    def test_game_code_generation(self):
+    async def test_game_code_generation(self):
         """Test that games have 6-character codes"""
         if not self.game_data:
             return False
@@ -329,127 +555,156 @@ class TicTacToeAPITester:
             self.log(f"   Game code missing or invalid: {self.game_data.get('code', 'None')}", "ERROR")
             return False
 
-    def test_get_game_by_code(self):
+    async def test_get_game_by_code(self):
         """Test getting game by code"""
         if not self.game_data or 'code' not in self.game_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Game by Code",
             "GET",
             f"games/by-code/{self.game_data['code']}",
             200
         )
         
-        if success and response.get('id') == self.game_data['id']:
+        if result.ok and result.body.get('id') == self.game_data['id']:
             self.log(f"   Retrieved game by code: {self.game_data['code']}")
             return True
         return False
 
-    def test_join_game_by_code(self):
+    async def test_join_game_by_code(self):
         """Test joining game by code (should fail for same player)"""
         if not self.game_data or not self.player_data or 'code' not in self.game_data:
             return False
             
         # This should fail because player can't join their own game
-        success, response = self.run_test(
+        result = await self.run_test(
             "Join Game by Code (Own Game - Should Fail)",
             "POST",
             "games/join-by-code",
             400,  # Should return 400 for joining own game
             data={"player_id": self.player_data['id'], "code": self.game_data['code']}
         )
-        return success  # Success means we got the expected 400 error
+        return result.ok  # Success means we got the expected 400 error
 
-    def test_search_players(self):
+    async def test_search_players(self):
         """Test searching for players"""
         if not self.player_data:
             return False
             
         # Search for the player we created
         search_query = self.player_data['username'][:3]  # First 3 characters
-        success, response = self.run_test(
+        result = await self.run_test(
             "Search Players",
             "GET",
             f"players/search/{search_query}",
             200
         )
         
-        if success and isinstance(response, list):
+        if result.ok and isinstance(result.body, list):
             # Should find at least our player
-            found_player = any(p['id'] == self.player_data['id'] for p in response)
+            found_player = any(p['id'] == self.player_data['id'] for p in result.body)
             if found_player:
-                self.log(f"   Found {len(response)} players matching '{search_query}'")
+                self.log(f"   Found {len(result.body)} players matching '{search_query}'")
                 return True
             else:
                 self.log(f"   Player not found in search results", "ERROR")
         return False
 
-    def test_get_player_games_by_username(self):
+    async def test_get_player_games_by_username(self):
         """Test getting player games by username"""
         if not self.player_data:
             return False
             
-        success, response = self.run_test(
+        result = await self.run_test(
             "Get Player Games by Username",
             "GET",
             f"players/{self.player_data['username']}/games",
             200
         )
         
-        if success and isinstance(response, list):
-            self.log(f"   Found {len(response)} games for player {self.player_data['username']}")
+        if result.ok and isinstance(result.body, list):
+            self.log(f"   Found {len(result.body)} games for player {self.player_data['username']}")
             return True
         return False
 
-    def run_all_tests(self):
-        """Run all API tests in sequence"""
+    def _select(self, names: tuple[str, ...]) -> list:
+        """Bind the tests whose names match the filter, keeping their order"""
+        return [getattr(self, name) for name in names if fnmatch.fnmatchcase(name, self.test_filter)]
+
+    async def _run_guarded(self, test):
+        """Run one test, recording it as failed if it returns False or raises"""
+        try:
+            passed = await test()
+        except Exception as e:
+            self.log(f"❌ Test {test.__name__} failed with exception: {str(e)}", "ERROR")
+            passed = False
+        if not passed:
+            self.failed_tests.append(test.__name__)
+
+    async def run_all_tests(self):
+        """Run all API tests, overlapping the independent read-only ones"""
         self.log("🚀 Starting Tic-Tac-Toe API Tests")
         self.log(f"Testing against: {self.base_url}")
         
-        tests = [
-            self.test_root_endpoint,
-            self.test_create_player,
-            self.test_get_player,
-            self.test_player_stats_empty,
-            self.test_create_local_game,
-            self.test_game_code_generation,
-            self.test_get_game,
-            self.test_get_game_by_code,
-            self.test_join_game_by_code,
-            self.test_make_moves_complete_game,
-            self.test_invalid_move,
-            self.test_game_replay,
-            self.test_player_stats_after_game,
-            self.test_player_history,
-            self.test_search_players,
-            self.test_get_player_games_by_username,
-            self.test_create_online_game,
-            self.test_get_waiting_games,
-            self.test_rematch_request,
-        ]
-        
-        for test in tests:
-            try:
-                test()
-            except Exception as e:
-                self.log(f"❌ Test {test.__name__} failed with exception: {str(e)}", "ERROR")
-        
-        # Print final results
-        self.log("=" * 50)
-        self.log(f"📊 Test Results: {self.tests_passed}/{self.tests_run} passed")
+        setup_names = self.SETUP_TESTS
+        if self.fused:
+            setup_names = tuple(
+                'test_bootstrap' if name == self.FUSED_TESTS[0] else name
+                for name in setup_names if name not in self.FUSED_TESTS[1:]
+            )
+        # Setup always runs in full: the filtered tests depend on its state.
+        setup_tests = [getattr(self, name) for name in setup_names]
+        read_only_tests = self._select(self.READ_ONLY_TESTS)
+        write_tests = self._select(self.WRITE_TESTS)
+        if not read_only_tests and not write_tests:
+            self.log(f"❌ No tests match filter '{self.test_filter}'", "ERROR")
+            self._flush_logs()
+            return 1
         
-        if self.tests_passed == self.tests_run:
-            self.log("🎉 All tests passed!")
-            return 0
-        else:
-            self.log(f"⚠️  {self.tests_run - self.tests_passed} tests failed")
+        try:
+            for test in setup_tests:
+                await self._run_guarded(test)
+            self._flush_logs()
+            # One batched await; each test is guarded, so a failing read
+            # cannot cancel its siblings. The counters are only touched
+            # between awaits, so the interleaving cannot lose counts.
+            await asyncio.gather(*(self._run_guarded(test) for test in read_only_tests))
+            self._flush_logs()
+            for test in write_tests:
+                await self._run_guarded(test)
+            
+            # Print final results
+            self.log("=" * 50)
+            self.log(f"📊 Test Results: {self.tests_passed}/{self.tests_run} passed")
+            
+            if self.failed_tests:
+                self.log(f"   Failed tests: {', '.join(self.failed_tests)}", "ERROR")
+            if self.tests_run and self.tests_passed == self.tests_run and not self.failed_tests:
+                self.log("🎉 All tests passed!")
+                return 0
+            self.log(f"⚠️  {self.tests_run - self.tests_passed} requests and {len(self.failed_tests)} tests failed")
             return 1
+        finally:
+            if self._session is not None:
+                await self._session.close()
+            # Also runs on Ctrl-C or an escaping exception, so buffered lines
+            # are never lost.
+            self._flush_logs()
 
 def main():
     """Main test runner"""
-    tester = TicTacToeAPITester()
-    return tester.run_all_tests()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stream-logs", action="store_true",
+                        help="print each log line immediately instead of once per phase")
+    parser.add_argument("--filter", default="*", metavar="PATTERN",
+                        help="only run read/write tests whose names match this fnmatch pattern; setup always runs")
+    parser.add_argument("--fused", action="store_true",
+                        help="create the player and local game with one /session/bootstrap call")
+    args = parser.parse_args()
+    tester = TicTacToeAPITester(stream_logs=args.stream_logs, test_filter=args.filter, fused=args.fused)
+    run = uvloop.run if uvloop is not None else asyncio.run
+    return run(tester.run_all_tests())
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
 import { getWebSocketUrl } from '@/lib/api';
 
+const textDecoder = new TextDecoder();
+
 export const useWebSocket = (gameId, playerId) => {
   const [isConnected, setIsConnected] = useState(false);
   const [lastMessage, setLastMessage] = useState(null);
@@ -15,6 +17,7 @@ export const useWebSocket = (gameId, playerId) => {
     try {
       const wsUrl = getWebSocketUrl(gameId, playerId);
       wsRef.current = new WebSocket(wsUrl);
+      wsRef.current.binaryType = 'arraybuffer';
 
       wsRef.current.onopen = () => {
         setIsConnected(true);
@@ -30,7 +33,9 @@ export const useWebSocket = (gameId, playerId) => {
 
       wsRef.current.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data);
+          // Broadcasts arrive as binary UTF-8 JSON frames, replies as text.
+          const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+          const data = JSON.parse(text);
           if (data.type !== 'pong') {
             setLastMessage(data);
           }
@@ -89,7 +89,16 @@ export const requestRematch = async (gameId, playerId, mode) => {
 
 export const getGameReplay = async (gameId) => {
   const response = await api.get(`/games/${gameId}/replay`);
-  return response.data;
+  const { initial_board, deltas, ...data } = response.data;
+  // Rebuild one board snapshot per move from the compact move deltas.
+  let board = [...initial_board];
+  const snapshots = [{ board, move: null }];
+  deltas.forEach((delta, index) => {
+    board = [...board];
+    board[delta.position] = delta.symbol;
+    snapshots.push({ board, move: data.game.moves[index] || delta });
+  });
+  return { ...data, snapshots };
 };
 
 // WebSocket URL builder
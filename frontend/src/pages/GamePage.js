@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { usePlayer } from '@/context/PlayerContext';
 import { useWebSocket } from '@/hooks/useWebSocket';
@@ -11,6 +11,22 @@ import GameStatus from '@/components/game/GameStatus';
 import ParticleBackground from '@/components/ui/ParticleBackground';
 import { ArrowLeft, RefreshCw, Play, Wifi, WifiOff, Copy, Check } from 'lucide-react';
 
+// Apply a broadcast move onto the local game. Moves this client already
+// has (e.g. its own, from the HTTP response) are ignored.
+const applyMoveDelta = (game, delta) => {
+  const moves = game.moves || [];
+  if (moves.length >= delta.move_number) return game;
+  const board = [...game.state.board];
+  board[delta.move.position] = delta.move.symbol;
+  return {
+    ...game,
+    status: delta.status,
+    completed_at: delta.completed_at,
+    moves: [...moves, delta.move],
+    state: { ...game.state, ...delta.state, board },
+  };
+};
+
 const GamePage = () => {
   const { gameId } = useParams();
   const navigate = useNavigate();
@@ -20,10 +36,12 @@ const GamePage = () => {
   const [actionLoading, setActionLoading] = useState(false);
   const [copiedCode, setCopiedCode] = useState(false);
 
-  const { isConnected, lastMessage, connectionError } = useWebSocket(
+  const { isConnected, lastMessage, connectionError, sendMessage } = useWebSocket(
     game?.mode === 'online' ? gameId : null,
     player?.id
   );
+  const gameRef = useRef(null);
+  gameRef.current = game;
 
   // Fetch initial game state
   useEffect(() => {
@@ -47,7 +65,15 @@ const GamePage = () => {
   // Handle WebSocket messages
   useEffect(() => {
     if (lastMessage) {
-      if (lastMessage.type === 'game_update' || lastMessage.type === 'connected' || lastMessage.type === 'player_joined') {
+      if (lastMessage.type === 'move') {
+        const current = gameRef.current;
+        if (current && (current.moves || []).length < lastMessage.move_number - 1) {
+          // A move was missed; fetch the full game instead of guessing.
+          sendMessage({ type: 'resync' });
+        } else {
+          setGame(prev => (prev ? applyMoveDelta(prev, lastMessage) : prev));
+        }
+      } else if (lastMessage.type === 'connected' || lastMessage.type === 'resync' || lastMessage.type === 'player_joined') {
         setGame(lastMessage.game);
         
         if (lastMessage.type === 'player_joined') {
@@ -60,7 +86,7 @@ const GamePage = () => {
         navigate(`/game/${lastMessage.new_game_id}`);
       }
     }
-  }, [lastMessage, navigate]);
+  }, [lastMessage, navigate, sendMessage]);
 
   // Redirect if no player
   useEffect(() => {